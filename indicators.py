@@ -0,0 +1,93 @@
+"""Numba kernels for the scanner.
+
+JIT-compiled (and disk-cached) on first use. Run `python indicators.py` to
+build them ahead of time into the `indicators_aot` extension module, which
+main.py prefers while it matches the current sources.
+"""
+import numpy as np
+from numba import njit
+
+from signals import (
+    MA9_21_UP, MA9_21_DOWN, MA21_50_UP, MA21_50_DOWN,
+    MACD_UP, MACD_DOWN, RSI_OVERBOUGHT, RSI_OVERSOLD,
+)
+
+@njit(fastmath=True, cache=True)
+def multi_ewma(x, alphas):
+    """EMAs of x for several alphas in one pass, matching pandas ewm(adjust=False).
+
+    Column k is s[t] = alphas[k]*x[t] + (1-alphas[k])*s[t-1], s[0] = x[0].
+    """
+    n, K = len(x), len(alphas)
+    s = np.empty((n, K), x.dtype)
+    if n == 0:
+        return s
+    s[0] = x[0]
+    for i in range(1, n):
+        for k in range(K):
+            s[i, k] = alphas[k] * x[i] + (1 - alphas[k]) * s[i - 1, k]
+    return s
+
+@njit(cache=True)
+def scan(ma9, ma21, ma50, macd, rsi, look_forward):
+    """Returns (bar index, signals.SIGNAL_NAMES index) arrays for every signal found."""
+    n = len(ma9)
+    # Signal table as packed parallel arrays, filled up to k
+    bars = np.empty(n, np.int64)
+    codes = np.empty(n, np.int8)
+    k = 0
+
+    # Loop through history (stop early for forward calc)
+    for i in range(50, n - look_forward):
+        # Crossovers compare the current bar against the bar two back
+        p = i - 2
+
+        # --- SIGNAL DEFINITIONS ---
+        # 1. MA 9/21
+        if ma9[p] < ma21[p] and ma9[i] > ma21[i]:
+            code = MA9_21_UP
+        elif ma9[p] > ma21[p] and ma9[i] < ma21[i]:
+            code = MA9_21_DOWN
+
+        # 2. MA 21/50
+        elif ma21[p] < ma50[p] and ma21[i] > ma50[i]:
+            code = MA21_50_UP
+        elif ma21[p] > ma50[p] and ma21[i] < ma50[i]:
+            code = MA21_50_DOWN
+
+        # 3. MACD Zero
+        elif macd[p] < 0 and macd[i] > 0:
+            code = MACD_UP
+        elif macd[p] > 0 and macd[i] < 0:
+            code = MACD_DOWN
+
+        # 4. RSI
+        elif rsi[p] < 70 and rsi[i] >= 70:
+            code = RSI_OVERBOUGHT
+        elif rsi[p] > 30 and rsi[i] <= 30:
+            code = RSI_OVERSOLD
+        else:
+            continue
+
+        bars[k] = i
+        codes[k] = code
+        k += 1
+
+    return bars[:k], codes[:k]
+
+# --- AOT BUILD ---
+if __name__ == "__main__":
+    from numba.pycc import CC
+    from signals import kernel_source_hash
+
+    # Frozen into the build as a constant; main.py skips the build if it no longer matches
+    SOURCE_HASH = kernel_source_hash()
+
+    def source_hash():
+        return SOURCE_HASH
+
+    cc = CC('indicators_aot')
+    cc.export('source_hash', 'i8()')(source_hash)
+    cc.export('multi_ewma', 'f4[:, :](f4[:], f4[:])')(multi_ewma.py_func)
+    cc.export('scan', 'Tuple((i8[:], i1[:]))(f4[:], f4[:], f4[:], f4[:], f4[:], i8)')(scan.py_func)
+    cc.compile()
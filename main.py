@@ -2,12 +2,51 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import sys
-from scipy.stats import linregress
+import os
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from signals import SIGNAL_NAMES, kernel_source_hash
+
+def _load_kernels():
+    """Prefers the ahead-of-time build (`python indicators.py`) unless it is missing or stale."""
+    try:
+        import indicators_aot
+        if indicators_aot.source_hash() == kernel_source_hash():
+            return indicators_aot
+    except (ImportError, AttributeError):
+        pass
+    import indicators
+    return indicators
+
+kernels = _load_kernels()
 
 # --- CONFIGURATION ---
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 1000)
 pd.options.display.float_format = '{:.2f}'.format
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "stock-backtester")
+
+def _forward_returns(close, days):
+    """% change from each bar to the bar `days` ahead (NaN past the end)."""
+    ret = np.full(len(close), np.nan)
+    if len(close) > days:
+        # Zero-copy [entry, next `days` closes] window per bar
+        fwd = sliding_window_view(close, days + 1)
+        ret[:-days] = (fwd[:, -1] - fwd[:, 0]) / fwd[:, 0] * 100
+    return ret
+
+def _prune_cache(today):
+    """Deletes cache files from earlier days; every file name starts with its date."""
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith((".parquet", ".parquet.tmp")) and not name.startswith(f"{today}_"):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
 
 class StockScanner:
     def __init__(self, ticker_input):
@@ -22,15 +61,11 @@ class StockScanner:
             return f"{t}.JK"
         return t
 
-    def fetch_data(self, period="2y"):
-        """Fetches data and calculates indicators."""
+    def fetch_data(self, period="2y", pending=None):
+        """Fetches data (or awaits a `pending` _download future) and calculates indicators."""
         print(f"\n--- 🇮🇩 Analyzing {self.ticker} ({period}) ---")
         try:
-            self.df = yf.download(self.ticker, period=period, progress=False)
-            
-            # Handle MultiIndex (Fix for new yfinance versions)
-            if isinstance(self.df.columns, pd.MultiIndex):
-                self.df.columns = self.df.columns.get_level_values(0)
+            self.df = pending.result() if pending is not None else self._download(period)
 
             if self.df.empty:
                 print(f"❌ Error: Data not found for {self.ticker}.")
@@ -38,7 +73,9 @@ class StockScanner:
 
             # Liquidity Check (Skip for Crypto/US)
             if ".JK" in self.ticker:
-                avg_val = (self.df['Close'] * self.df['Volume']).tail(20).mean()
+                close = self.df['Close'].to_numpy()[-20:]
+                volume = self.df['Volume'].to_numpy()[-20:]
+                avg_val = float(np.nanmean(close * volume))
                 if avg_val < 5_000_000_000:
                     print(f"⚠️  WARNING: Low Liquidity (Avg Val < 5M IDR). Signals may be unreliable.")
 
@@ -48,94 +85,110 @@ class StockScanner:
             print(f"Error fetching data: {e}")
             return False
 
+    def _download(self, period):
+        """Downloads OHLCV data, reusing today's on-disk copy if present."""
+        today = date.today().isoformat()
+        key = hashlib.sha1(f"{self.ticker}|{period}".encode()).hexdigest()
+        path = os.path.join(CACHE_DIR, f"{today}_{key}.parquet")
+        if os.path.exists(path):
+            try:
+                return pd.read_parquet(path, dtype_backend='pyarrow')
+            except Exception:
+                # Unreadable (e.g. truncated) cache file: drop it and download again
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        # Ticker.history rather than yf.download: download() shares module-level
+        # state between calls, so concurrent downloads (scan_tickers) mix frames
+        df = yf.Ticker(self.ticker).history(period=period, actions=False)
+
+        if df.empty:
+            return df
+
+        # Bars without a close would poison every recursive indicator after them
+        df = df.dropna(subset=['Close'])
+
+        # Arrow-backed columns, so the frame is columnar and shared zero-copy with parquet
+        df = df.convert_dtypes(dtype_backend='pyarrow')
+
+        tmp = None
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Write to a temp file and rename it into place, so an interrupted
+            # write never leaves a partial file at the cache path
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix=f"{today}_", suffix=".parquet.tmp")
+            os.close(fd)
+            df.to_parquet(tmp, compression='zstd')
+            os.replace(tmp, path)
+            _prune_cache(today)
+        except OSError as e:
+            print(f"⚠️  WARNING: Could not cache data ({e}).")
+        finally:
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+        return df
+
     def _calculate_indicators(self):
         df = self.df
-        # Moving Averages
-        df['MA9'] = df['Close'].ewm(span=9, adjust=False).mean()
-        df['MA21'] = df['Close'].ewm(span=21, adjust=False).mean()
-        df['MA50'] = df['Close'].ewm(span=50, adjust=False).mean()
-
-        # MACD (12, 26, 9)
-        df['EMA12'] = df['Close'].ewm(span=12, adjust=False).mean()
-        df['EMA26'] = df['Close'].ewm(span=26, adjust=False).mean()
-        df['MACD_Line'] = df['EMA12'] - df['EMA26']
-        
-        # RSI (14)
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        close32 = np.ascontiguousarray(df['Close'].to_numpy(np.float32))
+        # EMA spans 9/21/50 (MAs) and 12/26 (MACD) in a single pass over Close
+        spans = np.array([9, 21, 50, 12, 26], np.float32)
+        ema = kernels.multi_ewma(close32, 2 / (spans + 1))
+
+        # RSI (14) with Wilder smoothing: avg[t] = avg[t-1] * 13/14 + x[t] / 14
+        delta = np.diff(close32, prepend=close32[0])
+        b, a = np.array([1 / 14], np.float32), np.array([1, -13 / 14], np.float32)
+        avg_gain = lfilter(b, a, np.maximum(delta, 0))
+        avg_loss = lfilter(b, a, np.maximum(-delta, 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        # Attach all indicator columns in one concat instead of one insert each
+        self.df = pd.concat([df, pd.DataFrame({
+            # Moving Averages
+            'MA9': ema[:, 0], 'MA21': ema[:, 1], 'MA50': ema[:, 2],
+            # MACD (12, 26, 9)
+            'MACD_Line': ema[:, 3] - ema[:, 4],
+            'RSI': rsi,
+        }, index=df.index)], axis=1)
 
     def run_backtest(self):
         """Retests historical signals."""
         if self.df is None: return
 
-        df = self.df.copy()
-        # Shift for crossover detection
-        df['Prev_MA9'] = df['MA9'].shift(1)
-        df['Prev_MA21'] = df['MA21'].shift(1)
-        df['Prev_MA50'] = df['MA50'].shift(1)
-        df['Prev_MACD'] = df['MACD_Line'].shift(1)
-        df['Prev_RSI'] = df['RSI'].shift(1)
-
-        signals = []
-        
-        # Loop through history (stop 20 days early for forward calc)
-        for i in range(50, len(df) - 20):
-            curr = df.iloc[i]
-            prev = df.iloc[i-1]
-            
-            # Future Returns
-            ret_5d = self._get_return(i, 5)
-            ret_10d = self._get_return(i, 10)
-            ret_20d = self._get_return(i, 20)
-            
-            sig_type = None
-
-            # --- SIGNAL DEFINITIONS ---
-            # 1. MA 9/21
-            if prev['Prev_MA9'] < prev['Prev_MA21'] and curr['MA9'] > curr['MA21']:
-                sig_type = 'MA 9 > 21 (Bull Momentum)'
-            elif prev['Prev_MA9'] > prev['Prev_MA21'] and curr['MA9'] < curr['MA21']:
-                sig_type = 'MA 9 < 21 (Bear Momentum)'
-            
-            # 2. MA 21/50
-            elif prev['Prev_MA21'] < prev['Prev_MA50'] and curr['MA21'] > curr['MA50']:
-                sig_type = 'MA 21 > 50 (Bull Trend)'
-            elif prev['Prev_MA21'] > prev['Prev_MA50'] and curr['MA21'] < curr['MA50']:
-                sig_type = 'MA 21 < 50 (Bear Trend)'
-
-            # 3. MACD Zero
-            elif prev['Prev_MACD'] < 0 and curr['MACD_Line'] > 0:
-                sig_type = 'MACD Zero Cross Up'
-            elif prev['Prev_MACD'] > 0 and curr['MACD_Line'] < 0:
-                sig_type = 'MACD Zero Cross Down'
-
-            # 4. RSI
-            elif prev['Prev_RSI'] < 70 and curr['RSI'] >= 70:
-                sig_type = 'RSI Enter >70 (Overbought)'
-            elif prev['Prev_RSI'] > 30 and curr['RSI'] <= 30:
-                sig_type = 'RSI Enter <30 (Oversold)'
-
-            if sig_type:
-                signals.append({
-                    'Signal': sig_type,
-                    'Ret_5d': ret_5d, 'Ret_10d': ret_10d, 'Ret_20d': ret_20d
-                })
+        df = self.df
+        bars, codes = kernels.scan(
+            df['MA9'].to_numpy(), df['MA21'].to_numpy(), df['MA50'].to_numpy(),
+            df['MACD_Line'].to_numpy(), df['RSI'].to_numpy(), 20,  # look_forward
+        )
 
         # Summarize
-        if not signals:
+        if len(codes) == 0:
             print("No signals found in this period.")
             return
 
-        res = pd.DataFrame(signals)
-        summary = res.groupby('Signal').agg(
-            Count=('Ret_5d', 'count'),
-            Avg_5d=('Ret_5d', 'mean'),
-            Avg_20d=('Ret_20d', 'mean'),
-            Win_Rate_20d=('Ret_20d', lambda x: (x > 0).mean() * 100)
-        ).sort_values(by='Count', ascending=False)
+        # Future Returns
+        close = df['Close'].to_numpy()
+        ret5 = _forward_returns(close, 5)[bars]
+        ret20 = _forward_returns(close, 20)[bars]
+
+        # Per-signal stats as bincounts over the codes; NaN returns are
+        # skipped in Count/Avg and count as losses in Win_Rate, as before
+        k = len(SIGNAL_NAMES)
+        ok5, ok20 = ~np.isnan(ret5), ~np.isnan(ret20)
+        seen = np.bincount(codes, minlength=k)
+        count = np.bincount(codes[ok5], minlength=k)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            summary = pd.DataFrame({
+                'Count': count,
+                'Avg_5d': np.bincount(codes[ok5], ret5[ok5], k) / count,
+                'Avg_20d': np.bincount(codes[ok20], ret20[ok20], k) / np.bincount(codes[ok20], minlength=k),
+                'Win_Rate_20d': np.bincount(codes, ret20 > 0, k) / seen * 100,
+            }, index=pd.Index(SIGNAL_NAMES, name='Signal'))
+        # Name order first so ties in Count list the same way groupby did
+        summary = summary[seen > 0].sort_index().sort_values(by='Count', ascending=False)
 
         print(f"\n📊 HISTORICAL BEHAVIOR (Last 2 Years)")
         print(summary)
@@ -149,16 +202,16 @@ class StockScanner:
         # Helper to calc slope and intersection
         def predict_cross(short_ma, long_ma, name_short, name_long):
             # Get last 5 days
-            s_series = self.df[short_ma].tail(5)
-            l_series = self.df[long_ma].tail(5)
+            s = self.df[short_ma].to_numpy()[-5:]
+            l = self.df[long_ma].to_numpy()[-5:]
             
-            # Linear Regression on slopes
-            x = np.arange(len(s_series))
-            slope_s, _, _, _, _ = linregress(x, s_series)
-            slope_l, _, _, _, _ = linregress(x, l_series)
+            # Least-squares slope: sum(xc * y) / sum(xc^2) with centered x
+            xc = np.arange(len(s)) - (len(s) - 1) / 2
+            slope_s = (xc * s).sum() / (xc ** 2).sum()
+            slope_l = (xc * l).sum() / (xc ** 2).sum()
             
-            curr_s = s_series.iloc[-1]
-            curr_l = l_series.iloc[-1]
+            curr_s = s[-1]
+            curr_l = l[-1]
             gap = curr_s - curr_l
             net_slope = slope_s - slope_l # How fast gap is closing
 
@@ -181,22 +234,32 @@ class StockScanner:
         last_rsi = self.df['RSI'].iloc[-1]
         print(f"   • Current Price: {last_price:,.0f} | RSI: {last_rsi:.1f}")
 
-    def _get_return(self, idx, days):
-        try:
-            future = self.df.iloc[idx + days]['Close']
-            curr = self.df.iloc[idx]['Close']
-            return ((future - curr) / curr) * 100
-        except IndexError:
-            return np.nan
+def scan_tickers(tickers, period="2y", max_workers=16):
+    """Downloads all tickers concurrently, then analyzes them in order. Returns the scanners."""
+    # One scanner per formatted ticker, first occurrence wins (BBCA == BBCA.JK)
+    unique = {}
+    for t in tickers:
+        scanner = StockScanner(t)
+        unique.setdefault(scanner.ticker, scanner)
+    scanners = list(unique.values())
+    # Downloads are network-bound, so threads overlap the round-trips
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = [pool.submit(s._download, period) for s in scanners]
+        for scanner, future in zip(scanners, pending):
+            # One ticker's failure must not end the scan for the rest
+            try:
+                if scanner.fetch_data(period, pending=future):
+                    scanner.run_backtest()
+                    scanner.run_prediction()
+            except Exception as e:
+                print(f"❌ Error analyzing {scanner.ticker}: {e}")
+    return scanners
 
 # --- MAIN EXECUTION ---
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        ticker = sys.argv[1]
+        tickers = sys.argv[1:]
     else:
-        ticker = input("Enter Ticker (e.g. BBCA): ")
+        tickers = input("Enter Ticker(s) (e.g. BBCA, BBRI): ").replace(",", " ").split()
 
-    scanner = StockScanner(ticker)
-    if scanner.fetch_data():
-        scanner.run_backtest()
-        scanner.run_prediction()
\ No newline at end of file
+    scan_tickers(tickers)
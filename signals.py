@@ -0,0 +1,27 @@
+"""Signal codes shared by the numba kernels and the report.
+
+Kept free of numba so main.py can import it without paying the JIT import
+cost when the ahead-of-time `indicators_aot` build is used.
+"""
+import hashlib
+import os
+
+# Signal codes emitted by indicators.scan; SIGNAL_NAMES[code] is the display label
+(MA9_21_UP, MA9_21_DOWN, MA21_50_UP, MA21_50_DOWN,
+ MACD_UP, MACD_DOWN, RSI_OVERBOUGHT, RSI_OVERSOLD) = range(8)
+SIGNAL_NAMES = (
+    'MA 9 > 21 (Bull Momentum)', 'MA 9 < 21 (Bear Momentum)',
+    'MA 21 > 50 (Bull Trend)', 'MA 21 < 50 (Bear Trend)',
+    'MACD Zero Cross Up', 'MACD Zero Cross Down',
+    'RSI Enter >70 (Overbought)', 'RSI Enter <30 (Oversold)',
+)
+
+def kernel_source_hash():
+    """Fingerprint of the kernel sources, baked into the AOT build to detect stale copies."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha1()
+    for name in ('indicators.py', 'signals.py'):
+        with open(os.path.join(here, name), 'rb') as f:
+            h.update(f.read())
+    # Fits in the int64 return type of the exported AOT function
+    return int(h.hexdigest()[:15], 16)
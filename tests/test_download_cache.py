@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+
+def test_download_replaces_earlier_days_cache(monkeypatch, tmp_path):
+    bars = pd.DataFrame({
+        'Open': [1.0, 2.0], 'High': [1.0, 2.0], 'Low': [1.0, 2.0],
+        'Close': [1.0, 2.0], 'Volume': [10, 20],
+    }, index=pd.bdate_range('2024-01-01', periods=2, name='Date'))
+    monkeypatch.setattr(yf.Ticker, 'history', lambda self, *args, **kwargs: bars)
+    monkeypatch.setattr(main, 'CACHE_DIR', str(tmp_path))
+
+    stale = ["2000-01-01_abc.parquet", "2000-01-01_def.parquet.tmp", "0123456789abcdef.parquet"]
+    for name in stale:
+        (tmp_path / name).write_bytes(b"old")
+    (tmp_path / "notes.txt").write_text("keep")
+
+    df = main.StockScanner('BBCA')._download("2y")
+
+    np.testing.assert_allclose(df['Close'].to_numpy(), [1.0, 2.0])
+    files = set(os.listdir(tmp_path))
+    assert "notes.txt" in files
+    [cached] = files - {"notes.txt"}
+    assert cached.startswith(f"{date.today().isoformat()}_") and cached.endswith(".parquet")
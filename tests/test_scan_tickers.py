@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+
+def _bars(ticker):
+    """Distinct random-walk OHLCV per ticker, so frames can be told apart."""
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    close = 1000 * (1 + sum(map(ord, ticker)) % 50) * np.exp(np.cumsum(rng.normal(0, 0.02, 120)))
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(10_000_000, 20_000_000, len(close)),
+    }, index=pd.bdate_range('2024-01-01', periods=len(close), name='Date'))
+
+
+def test_scan_tickers_gives_each_scanner_its_own_frame(monkeypatch, tmp_path):
+    def slow_history(self, *args, **kwargs):
+        # Overlap the downloads so any shared state between calls gets mixed up
+        time.sleep(random.uniform(0.05, 0.3))
+        return _bars(self.ticker)
+
+    monkeypatch.setattr(yf.Ticker, 'history', slow_history)
+    monkeypatch.setattr(main, 'CACHE_DIR', str(tmp_path))
+
+    tickers = ['AAAA', 'BBBB', 'CCCC', 'DDDD']
+    scanners = main.scan_tickers(tickers)
+
+    assert [s.ticker for s in scanners] == [f"{t}.JK" for t in tickers]
+    for scanner in scanners:
+        expected = _bars(scanner.ticker)['Close'].to_numpy()
+        assert scanner.df is not None
+        np.testing.assert_allclose(scanner.df['Close'].to_numpy(), expected)
+
+
+def test_scan_tickers_continues_after_a_ticker_fails(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(yf.Ticker, 'history', lambda self, *args, **kwargs: _bars(self.ticker))
+    monkeypatch.setattr(main, 'CACHE_DIR', str(tmp_path))
+
+    predicted = []
+    def run_prediction(self):
+        if self.ticker == 'AAAA.JK':
+            raise RuntimeError("boom")
+        predicted.append(self.ticker)
+
+    monkeypatch.setattr(main.StockScanner, 'run_prediction', run_prediction)
+    main.scan_tickers(['AAAA', 'BBBB', 'CCCC'])
+
+    assert predicted == ['BBBB.JK', 'CCCC.JK']
+    assert "Error analyzing AAAA.JK: boom" in capsys.readouterr().out